@@ -1,56 +1,102 @@
 # app/chart.py
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from pathlib import Path
-from typing import Optional
-
-STATIC = Path(__file__).resolve().parent.parent / "static"
-STATIC.mkdir(parents=True, exist_ok=True)
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.lib import colors
+import math
 
 TABLE_HEADER_BLUE = "#4A90E2"
 
-def generate_chart(total_income: float, total_expense: float, out_path: Optional[str] = None) -> str:
-    labels = ["Income", "Expense"]
+# Fixed chart styling, resolved once at import instead of on every report
+BAR_FILL = colors.HexColor(TABLE_HEADER_BLUE)
+BAR_STROKE = colors.HexColor("#2c3e50")
+CATEGORY_NAMES = ["Income", "Expense"]
+GRID_DASH = (2, 2)
+_format_amount = "{:,.0f}".format
+
+def _format_axis_value(value: float) -> str:
+    """Axis tick label: thousands separators, decimals only when needed."""
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
+
+def _value_axis_scale(peak: float):
+    """
+    Return (value_max, value_step) for a 0-based axis with ~4 gridlines.
+    The chart shape is fixed, so computing the scale directly avoids
+    ReportLab's generic tick-search on every report. Steps are whole
+    numbers (at least 1). Returns None when the scale can't be computed
+    (e.g. totals near the float limit); the caller then leaves the axis
+    to ReportLab's automatic scaling.
+    """
+    if not math.isfinite(peak):
+        return None
+    if peak <= 0:
+        return 4, 1
+    raw_step = peak / 4
+    magnitude = 10 ** max(math.floor(math.log10(raw_step)), 0)
+    # 2.5 * magnitude is only a whole number from magnitude 10 upwards
+    nices = (1, 2, 2.5, 5, 10) if magnitude >= 10 else (1, 2, 5, 10)
+    for nice in nices:
+        step = nice * magnitude
+        if step >= raw_step:
+            break
+    # leave headroom above the tallest bar for its value label
+    headroom = peak * 1.1 / step
+    if not math.isfinite(headroom):
+        return None
+    value_max = step * math.ceil(headroom)
+    if not math.isfinite(value_max):
+        return None
+    return value_max, step
+
+def generate_chart(total_income: float, total_expense: float, width: float = 320, height: float = 180) -> Drawing:
+    """
+    Build the "Income vs Expense" bar chart as a ReportLab Drawing so it is
+    rendered as vector graphics in the same pass as the rest of the PDF.
+    """
     values = [float(total_income or 0.0), float(total_expense or 0.0)]
+    # A non-finite total (inf/nan) can't be drawn as a bar; leave it out
+    # of the chart rather than fail the whole report
+    plotted = [v if math.isfinite(v) else None for v in values]
 
-    plt.figure(figsize=(5, 4))
+    drawing = Drawing(width, height)
 
-    # Rounded, smooth bars
-    bars = plt.bar(
-        labels,
-        values,
-        color=TABLE_HEADER_BLUE,
-        edgecolor="#2c3e50",
-        linewidth=1,
-    )
+    bc = VerticalBarChart()
+    bc.x = 62
+    bc.y = 25
+    bc.width = width - 82
+    bc.height = height - 45
+    bc.data = [plotted]
+    bc.categoryAxis.categoryNames = CATEGORY_NAMES
+    bc.barWidth = 20
+    bc.groupSpacing = 30
+
+    # Bars in the same blue as the table headers
+    bc.bars[0].fillColor = BAR_FILL
+    bc.bars[0].strokeColor = BAR_STROKE
+    bc.bars[0].strokeWidth = 1
 
     # Value labels on top of bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(
-            bar.get_x() + bar.get_width() / 2,
-            height + (height * 0.02),
-            f"{height:,.0f}",
-            ha="center",
-            fontsize=10,
-        )
-
-    # Clean modern styling
-    plt.title("Income vs Expense", fontsize=14, fontweight="bold")
-    plt.ylabel("Amount", fontsize=10)
-
-    plt.grid(axis="y", linestyle="--", alpha=0.3)
-
-    # Remove top + right borders for clean look
-    ax = plt.gca()
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-
-    plt.tight_layout()
-
-    out = out_path or str(STATIC / "chart.png")
-    plt.savefig(out, dpi=140)
-    plt.close()
-    return out
+    bc.barLabelFormat = _format_amount
+    bc.barLabels.nudge = 7
+    bc.barLabels.fontSize = 8
+
+    # Clean modern styling: light dashed grid, no top/right borders
+    bc.valueAxis.valueMin = 0
+    scale = _value_axis_scale(max((v for v in plotted if v is not None), default=0.0))
+    if scale is not None:
+        bc.valueAxis.valueMax, bc.valueAxis.valueStep = scale
+    bc.valueAxis.visibleGrid = True
+    bc.valueAxis.gridStrokeColor = colors.lightgrey
+    bc.valueAxis.gridStrokeDashArray = GRID_DASH
+    bc.valueAxis.labels.fontSize = 8
+    bc.valueAxis.labelTextFormat = _format_axis_value
+    bc.categoryAxis.labels.fontSize = 9
+
+    drawing.add(bc)
+
+    # Rotated "Amount" label left of the value axis
+    y_label = Group(String(0, 0, "Amount", fontName="Helvetica", fontSize=9, textAnchor="middle"))
+    y_label.translate(10, bc.y + bc.height / 2)
+    y_label.rotate(90)
+    drawing.add(y_label)
+    return drawing
@@ -1,20 +1,96 @@
 from fastapi import FastAPI, Request, Form
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+from collections import OrderedDict
+import asyncio
+import hashlib
+import io
 import json
-import tempfile
+import math
+import threading
+import time
 
-from app.schemas import FarmerData
+from app.schemas import Entry, FarmerData
 from app.pdf_generator import generate_pdf
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 templates = Jinja2Templates(directory=str(BASE_DIR / "app" / "templates"))
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 
+# Recently generated PDFs keyed by a hash of their input, so repeated
+# downloads/retries of the same report skip the ReportLab build. Entries
+# expire after a few minutes since the PDF header embeds a timestamp.
+PDF_CACHE_MAX_ENTRIES = 32
+PDF_CACHE_TTL_SECONDS = 300
+_pdf_cache = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+def _pdf_cache_get(key: str):
+    with _pdf_cache_lock:
+        hit = _pdf_cache.get(key)
+        if hit is None:
+            return None
+        created, pdf_bytes = hit
+        if time.monotonic() - created > PDF_CACHE_TTL_SECONDS:
+            del _pdf_cache[key]
+            return None
+        _pdf_cache.move_to_end(key)
+        return pdf_bytes
+
+def _pdf_cache_put(key: str, pdf_bytes: bytes):
+    with _pdf_cache_lock:
+        _pdf_cache[key] = (time.monotonic(), pdf_bytes)
+        _pdf_cache.move_to_end(key)
+        while len(_pdf_cache) > PDF_CACHE_MAX_ENTRIES:
+            _pdf_cache.popitem(last=False)
+
+def _build_entries(items):
+    """
+    Turn decoded form JSON into Entry objects without a full Pydantic
+    validation pass. Returns None if any item is invalid.
+
+    Deliberately stricter than Entry (which runs in lax mode): category and
+    date must be JSON strings, amount a JSON number (numeric strings such
+    as "100" are refused) that is non-negative and finite (Entry's ge=0
+    lets inf through), description a string or absent. Keep in step with
+    Entry when its fields change.
+    """
+    if not isinstance(items, list):
+        return None
+    entries = []
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        category = item.get("category")
+        amount = item.get("amount")
+        date = item.get("date")
+        description = item.get("description")
+        if not isinstance(category, str) or not isinstance(date, str):
+            return None
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+            return None
+        # convert first: huge JSON integers overflow float()
+        try:
+            amount = float(amount)
+        except OverflowError:
+            return None
+        # NaN fails 0 <= amount; Infinity can't be totalled or charted
+        if not (0 <= amount and math.isfinite(amount)):
+            return None
+        if description is not None and not isinstance(description, str):
+            return None
+        entries.append(Entry.model_construct(
+            category=category,
+            amount=amount,
+            date=date,
+            description=description,
+        ))
+    return entries
+
 @app.get("/", response_class=HTMLResponse)
 async def form_ui(request: Request):
     return templates.TemplateResponse("form.html", {"request": request})
@@ -36,13 +112,21 @@ async def generate(
     try:
         expenses = json.loads(expenses_json)
         incomes = json.loads(incomes_json)
-    except json.JSONDecodeError:
+    except ValueError:
+        # JSONDecodeError, or an integer literal over Python's digit limit
         return RedirectResponse(url="/", status_code=303)
 
     if total_acres is None or total_acres <= 0:
         return RedirectResponse(url="/", status_code=303)
 
-    data = FarmerData(
+    # Entries are checked by _build_entries; form fields are already typed
+    # by FastAPI, so skip model validation
+    expenses = _build_entries(expenses)
+    incomes = _build_entries(incomes)
+    if expenses is None or incomes is None:
+        return RedirectResponse(url="/", status_code=303)
+
+    data = FarmerData.model_construct(
         farmer_name=farmer_name,
         crop_name=crop_name,
         season=season,
@@ -55,7 +139,18 @@ async def generate(
         incomes=incomes,
     )
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        pdf_path = generate_pdf(data, output_path=tmp.name)
+    key = hashlib.sha256(data.model_dump_json().encode()).hexdigest()
+    pdf_bytes = _pdf_cache_get(key)
+    if pdf_bytes is None:
+        # ReportLab build is CPU-bound; run it in a worker thread so the
+        # event loop keeps serving other requests meanwhile
+        buf = io.BytesIO()
+        await asyncio.to_thread(generate_pdf, data, buf)
+        pdf_bytes = buf.getvalue()
+        _pdf_cache_put(key, pdf_bytes)
 
-    return FileResponse(pdf_path, filename="farm_report.pdf", media_type="application/pdf")
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'attachment; filename="farm_report.pdf"'},
+    )
@@ -1,22 +1,62 @@
 # app/pdf_generator.py
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 )
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 from datetime import datetime
+from functools import lru_cache
+import heapq
+import re
 from pathlib import Path
+import threading
+from typing import BinaryIO
 from reportlab.lib.utils import ImageReader
 
 from app.chart import generate_chart
 
 DEFAULT_FOOTER = "Proudly maintained accounting with GramIQ"
+NO_ENTRIES_TEXT = "No entries recorded."
+
+# Money formatter bound once; avoids re-parsing the format spec per cell
+_MONEY = "{:,.2f}".format
 
 styles = getSampleStyleSheet()
 styles.add(ParagraphStyle(name='Center', alignment=1))
 
+def _parsed_heading(markup: str):
+    """
+    Parse a static Heading2 paragraph once and keep its (text, style, frags).
+    Flowables are mutated by wrap/split, so they can't be shared between
+    concurrent builds; _heading() instead creates a fresh Paragraph from the
+    pre-parsed fragments, skipping the markup parse on every report.
+    """
+    p = Paragraph(markup, styles['Heading2'])
+    return p.text, p.style, p.frags
+
+def _heading(parsed):
+    text, style, frags = parsed
+    return Paragraph(text, style, frags=frags)
+
+_H_CHART = _parsed_heading("<b>Income vs Expense Chart</b>")
+_H_EXPENSES = _parsed_heading("<b>Expense Breakdown</b>")
+_H_INCOMES = _parsed_heading("<b>Income Breakdown</b>")
+_H_LEDGER = _parsed_heading("<b>Ledger</b>")
+
+# Shared style for the breakdown/ledger tables: blue header with white
+# bold text, and every other data row shaded (whitesmoke) via ReportLab's
+# native ROWBACKGROUNDS striping, so it is independent of the row count.
+_BASE_TABLE_STYLE = TableStyle([
+    ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4A90E2")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.whitesmoke]),
+])
+
 # Project static folder
 STATIC = Path(__file__).resolve().parent.parent / "static"
 STATIC.mkdir(parents=True, exist_ok=True)
@@ -24,50 +64,115 @@ STATIC.mkdir(parents=True, exist_ok=True)
 # Acceptable logo filenames
 LOGO_CANDIDATES = [STATIC / "gramiq_logo.png", STATIC / "logo.png"]
 
+@lru_cache(maxsize=1)
 def _get_logo_path():
     for p in LOGO_CANDIDATES:
         if p.exists():
             return str(p)
     return None
 
-def _format_iso_to_ddmm(date_str: str) -> str:
+# Cached (ImageReader, draw_w, draw_h) for the header logo, or None if no
+# usable logo; _LOGO_UNSET until the first header is drawn
+_LOGO_UNSET = object()
+_LOGO = _LOGO_UNSET
+_LOGO_LOCK = threading.Lock()
+
+def _logo_reader():
     """
-    Convert ISO 'YYYY-MM-DD' to 'DD-MM-YYYY'. If parsing fails,
-    try common dd-mm-yyyy input, otherwise return the original string.
+    Load the logo and compute its scaled header size once per process.
+    Returns (reader, draw_w, draw_h), or None if there is no usable logo.
     """
-    if not date_str:
-        return ""
-    # Try ISO first
-    try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d")
-        return dt.strftime("%d-%m-%Y")
-    except Exception:
-        pass
-    # Try dd-mm-yyyy already formatted
-    try:
-        dt = datetime.strptime(date_str, "%d-%m-%Y")
-        return dt.strftime("%d-%m-%Y")
-    except Exception:
-        pass
-    # fallback: return as-is
-    return date_str
-
-def _parse_for_sort(date_str: str):
+    global _LOGO
+    if _LOGO is not _LOGO_UNSET:
+        return _LOGO
+    with _LOGO_LOCK:
+        if _LOGO is _LOGO_UNSET:
+            logo = None
+            logo_path = _get_logo_path()
+            if logo_path:
+                try:
+                    img = ImageReader(logo_path)
+                    max_logo_w = 30 * mm
+                    max_logo_h = 12 * mm
+                    iw, ih = img.getSize()
+                    ratio = min(max_logo_w / iw, max_logo_h / ih, 1.0)
+                    # decode pixel data now so concurrent PDFs only read it
+                    img.getRGBData()
+                    logo = (img, iw * ratio, ih * ratio)
+                except Exception:
+                    logo = None
+            _LOGO = logo
+    return _LOGO
+
+def _clear_logo_cache():
     """
-    Return a datetime for sorting if possible, else return the
-    original string to allow stable sorting fallback.
+    Forget the resolved logo path and cached reader, e.g. after swapping
+    the logo file without restarting the process. Only newly built PDFs
+    pick up the new logo: reports already in app.main's PDF cache keep
+    the old one until they expire (PDF_CACHE_TTL_SECONDS).
+    """
+    global _LOGO
+    with _LOGO_LOCK:
+        _get_logo_path.cache_clear()
+        _LOGO = _LOGO_UNSET
+
+# ISO 'YYYY-MM-DD' or already formatted 'DD-MM-YYYY'
+# (ASCII digits only, no trailing newline, matching the old strptime checks)
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})\Z|(\d{1,2})-(\d{1,2})-(\d{4})\Z", re.ASCII)
+
+def _parse_date(date_str: str):
+    """
+    Parse ISO 'YYYY-MM-DD' or 'DD-MM-YYYY' into a datetime with a single
+    precompiled regex match. Returns None if the string matches neither
+    form or is not a valid calendar date.
     """
     if not date_str:
-        return date_str
+        return None
+    m = _DATE_RE.fullmatch(date_str)
+    if not m:
+        return None
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
-    except Exception:
-        pass
-    try:
-        return datetime.strptime(date_str, "%d-%m-%Y")
-    except Exception:
-        pass
-    return date_str
+        if m.group(1):
+            return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        return datetime(int(m.group(6)), int(m.group(5)), int(m.group(4)))
+    except ValueError:
+        return None
+
+def _format_ddmm(dt: datetime) -> str:
+    """Format a parsed date as 'DD-MM-YYYY'."""
+    return f"{dt.day:02d}-{dt.month:02d}-{dt.year}"
+
+def _preprocess_entries(data):
+    """
+    Parse every entry date exactly once and return
+    (expenses, incomes, total_expense, total_income).
+    expenses/incomes are lists of dicts with keys: category, amount,
+    amount_fmt, dt, ddmm, description. 'dt' is None when the date cannot
+    be parsed; 'ddmm' then holds the original string so it is shown as
+    entered.
+    Totals are accumulated in the same pass.
+    """
+    def _prep(entries):
+        rows = []
+        total = 0.0
+        for e in entries:
+            raw = str(e.date)
+            dt = _parse_date(raw)
+            # amount is already validated as float by the Entry schema
+            total += e.amount
+            rows.append({
+                "category": str(e.category),
+                "amount": e.amount,
+                "amount_fmt": _MONEY(e.amount),
+                "dt": dt,
+                "ddmm": _format_ddmm(dt) if dt else raw,
+                "description": str(e.description or ""),
+            })
+        return rows, total
+
+    expenses, total_expense = _prep(data.expenses)
+    incomes, total_income = _prep(data.incomes)
+    return expenses, incomes, total_expense, total_income
 
 def _format_acres_value(acres_value):
     """
@@ -76,14 +181,17 @@ def _format_acres_value(acres_value):
       - '2.5' for 2.5
       - original string for non-numeric inputs
     """
-    try:
+    # Fast path: total_acres is a validated float, no parsing needed
+    if isinstance(acres_value, (int, float)):
         fv = float(acres_value)
-        if fv.is_integer():
-            return str(int(fv))
-        s = format(fv, 'f').rstrip('0').rstrip('.')
-        return s
-    except Exception:
-        return str(acres_value).strip()
+    else:
+        try:
+            fv = float(acres_value)
+        except (TypeError, ValueError):
+            return str(acres_value).strip()
+    if fv.is_integer():
+        return str(int(fv))
+    return f"{fv:f}".rstrip('0').rstrip('.')
 
 def _header_footer(canvas_obj, doc):
     """
@@ -102,16 +210,10 @@ def _header_footer(canvas_obj, doc):
     FOOTER_Y = 12 * mm
 
     # Draw logo left
-    logo_path = _get_logo_path()
-    if logo_path:
+    logo = _logo_reader()
+    if logo:
+        img, draw_w, draw_h = logo
         try:
-            img = ImageReader(logo_path)
-            max_logo_w = 30 * mm
-            max_logo_h = 12 * mm
-            iw, ih = img.getSize()
-            ratio = min(max_logo_w / iw, max_logo_h / ih, 1.0)
-            draw_w = iw * ratio
-            draw_h = ih * ratio
             canvas_obj.drawImage(img, 20 * mm, HEADER_LINE_Y - draw_h / 2, width=draw_w, height=draw_h, mask="auto")
         except Exception:
             pass
@@ -142,26 +244,14 @@ def _header_footer(canvas_obj, doc):
 
 
 
-def _apply_alternate_shading(table_style, rows_count, start_row=1, cols_from=0, cols_to=-1):
+def generate_pdf(data, out: BinaryIO):
     """
-    Add background shading to every other data row (i.e., rows 1..end).
-    table_style is a list to which we append ('BACKGROUND', (col0,rowN), (colN,rowN), color).
-    rows_count: total number of table rows (including header)
-    start_row: usually 1 (first data row)
-    cols_from/cols_to: column range to shade
-    """
-    shade = colors.whitesmoke
-    for r in range(start_row, rows_count):
-        if (r - start_row) % 2 == 1:
-            table_style.append(('BACKGROUND', (cols_from, r), (cols_to, r), shade))
-
-def generate_pdf(data, output_path: str):
-    """
-    Build and write a PDF report for the given FarmerData.
-    Returns the path to the generated PDF (same as output_path).
+    Build and write a PDF report for the given FarmerData into the
+    binary file-like object `out` (e.g. io.BytesIO).
+    Returns `out`.
     """
     doc = SimpleDocTemplate(
-        output_path,
+        out,
         pagesize=A4,
         leftMargin=20 * mm,
         rightMargin=20 * mm,
@@ -193,9 +283,11 @@ def generate_pdf(data, output_path: str):
     story.append(Paragraph(f"Location: {data.location}", styles['Normal']))
     story.append(Spacer(1, 8))
 
+    # Parse each entry date once and reuse it for all three tables;
+    # totals are accumulated in the same pass
+    expenses_pre, incomes_pre, total_expense, total_income = _preprocess_entries(data)
+
     # Finance summary calculations
-    total_income = sum(i.amount for i in data.incomes) if data.incomes else 0.0
-    total_expense = sum(e.amount for e in data.expenses) if data.expenses else 0.0
     profit = total_income - total_expense
     cost_per_acre = (total_expense / data.total_acres) if data.total_acres else 0.0
 
@@ -206,11 +298,11 @@ def generate_pdf(data, output_path: str):
         prod_display = ""
 
     summary_table = [
-        ["Total Income", f"{total_income:,.2f}"],
-        ["Total Expense", f"{total_expense:,.2f}"],
+        ["Total Income", _MONEY(total_income)],
+        ["Total Expense", _MONEY(total_expense)],
         ["Total Production", prod_display],
-        ["Profit or Loss", f"{profit:,.2f}"],
-        ["Cost of cultivation per acre", f"{cost_per_acre:,.2f}"],
+        ["Profit or Loss", _MONEY(profit)],
+        ["Cost of cultivation per acre", _MONEY(cost_per_acre)],
     ]
     t = Table(summary_table, colWidths=[120 * mm, 40 * mm])
 
@@ -227,83 +319,70 @@ def generate_pdf(data, output_path: str):
     story.append(t)
     story.append(Spacer(1, 12))
 
-    # Generate and add chart image (bigger and with heading)
-    chart_path = generate_chart(total_income, total_expense)
-    if chart_path:
-        story.append(Spacer(1, 40))
-        story.append(Paragraph("<b>Income vs Expense Chart</b>", styles['Heading2']))
-        story.append(Spacer(1, 6))
-        story.append(Spacer(1, 30))
-        story.append(Image(str(chart_path), width=320, height=180))
-        story.append(Spacer(1, 12))
+    # Generate and add chart drawing (bigger and with heading)
+    chart = generate_chart(total_income, total_expense, width=320, height=180)
+    story.append(Spacer(1, 40))
+    story.append(_heading(_H_CHART))
+    story.append(Spacer(1, 6))
+    story.append(Spacer(1, 30))
+    story.append(chart)
+    story.append(Spacer(1, 12))
 
     story.append(PageBreak())
 
     # Expense table
-    story.append(Paragraph("<b>Expense Breakdown</b>", styles['Heading2']))
-    exp_rows = [["Category", "Amount", "Date", "Description"]]
-    for e in data.expenses:
-        exp_rows.append([str(e.category), f"{float(e.amount):,.2f}", _format_iso_to_ddmm(str(e.date)), str(e.description or "")])
-    et = Table(exp_rows, colWidths=[60 * mm, 30 * mm, 35 * mm, 45 * mm])
-
-    et_style = [
-        ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
-        # Blue header with white bold text
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4A90E2")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-    ]
-    _apply_alternate_shading(et_style, rows_count=len(exp_rows), start_row=1, cols_from=0, cols_to=-1)
-    et.setStyle(TableStyle(et_style))
-    story.append(et)
+    story.append(_heading(_H_EXPENSES))
+    if expenses_pre:
+        exp_rows = [["Category", "Amount", "Date", "Description"]] + [
+            [e["category"], e["amount_fmt"], e["ddmm"], e["description"]]
+            for e in expenses_pre
+        ]
+        et = Table(exp_rows, colWidths=[60 * mm, 30 * mm, 35 * mm, 45 * mm])
+
+        et.setStyle(_BASE_TABLE_STYLE)
+        story.append(et)
+    else:
+        story.append(Paragraph(NO_ENTRIES_TEXT, styles['Italic']))
     story.append(Spacer(1, 12))
 
     # Income table
-    story.append(Paragraph("<b>Income Breakdown</b>", styles['Heading2']))
-    inc_rows = [["Category", "Amount", "Date", "Description"]]
-    for i in data.incomes:
-        inc_rows.append([str(i.category), f"{float(i.amount):,.2f}", _format_iso_to_ddmm(str(i.date)), str(i.description or "")])
-    it = Table(inc_rows, colWidths=[60 * mm, 30 * mm, 35 * mm, 45 * mm])
-
-    it_style = [
-        ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4A90E2")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-    ]
-    _apply_alternate_shading(it_style, rows_count=len(inc_rows), start_row=1, cols_from=0, cols_to=-1)
-    it.setStyle(TableStyle(it_style))
-    story.append(it)
+    story.append(_heading(_H_INCOMES))
+    if incomes_pre:
+        inc_rows = [["Category", "Amount", "Date", "Description"]] + [
+            [i["category"], i["amount_fmt"], i["ddmm"], i["description"]]
+            for i in incomes_pre
+        ]
+        it = Table(inc_rows, colWidths=[60 * mm, 30 * mm, 35 * mm, 45 * mm])
+
+        it.setStyle(_BASE_TABLE_STYLE)
+        story.append(it)
+    else:
+        story.append(Paragraph(NO_ENTRIES_TEXT, styles['Italic']))
     story.append(Spacer(1, 12))
 
     # Ledger (merged, sorted by date)
-    story.append(Paragraph("<b>Ledger</b>", styles['Heading2']))
-    ledger_rows = [["Date", "Particulars", "Type", "Description", "Amount"]]
-    merged = []
-    for e in data.expenses:
-        merged.append((str(e.date), str(e.category), "Expense", str(e.description or ""), float(e.amount)))
-    for i in data.incomes:
-        merged.append((str(i.date), str(i.category), "Income", str(i.description or ""), float(i.amount)))
-
-    merged_sorted = sorted(merged, key=lambda x: _parse_for_sort(x[0]))
-    for row in merged_sorted:
-        ledger_rows.append([_format_iso_to_ddmm(row[0]), row[1], row[2], row[3], f"{row[4]:,.2f}"])
-
-    lg = Table(ledger_rows, colWidths=[30 * mm, 55 * mm, 30 * mm, 45 * mm, 25 * mm])
-
-    lg_style = [
-        ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#4A90E2")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-    ]
-    _apply_alternate_shading(lg_style, rows_count=len(ledger_rows), start_row=1, cols_from=0, cols_to=-1)
-    lg.setStyle(TableStyle(lg_style))
-    story.append(lg)
+    story.append(_heading(_H_LEDGER))
+    if expenses_pre or incomes_pre:
+        # unparseable dates sort last instead of failing the datetime/str comparison
+        def ledger_key(x):
+            return x[0]["dt"] or datetime.max
+
+        # Sort each side once (near O(n) for already date-ordered journals),
+        # then merge linearly; ties keep expenses before incomes as before
+        exp_sorted = sorted(((e, "Expense") for e in expenses_pre), key=ledger_key)
+        inc_sorted = sorted(((i, "Income") for i in incomes_pre), key=ledger_key)
+        ledger_rows = [["Date", "Particulars", "Type", "Description", "Amount"]] + [
+            [r["ddmm"], r["category"], kind, r["description"], r["amount_fmt"]]
+            for r, kind in heapq.merge(exp_sorted, inc_sorted, key=ledger_key)
+        ]
+
+        lg = Table(ledger_rows, colWidths=[30 * mm, 55 * mm, 30 * mm, 45 * mm, 25 * mm])
+
+        lg.setStyle(_BASE_TABLE_STYLE)
+        story.append(lg)
+    else:
+        story.append(Paragraph(NO_ENTRIES_TEXT, styles['Italic']))
 
     # Build PDF with header/footer callback that draws logo/title/footer
     doc.build(story, onFirstPage=_header_footer, onLaterPages=_header_footer)
-    return output_path
+    return out
@@ -1,13 +1,17 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 class Entry(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     category: str = Field(...)
     amount: float = Field(..., ge=0)
     date: str = Field(...)
     description: Optional[str] = None
 
 class FarmerData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     farmer_name: str
     crop_name: str
     season: str